@@ -11,6 +11,8 @@ Nodes:
 
 import os
 import json
+import logging
+import functools
 from aiohttp import web
 from server import PromptServer
 
@@ -19,7 +21,9 @@ from .nodes.single_prompt_drafter import SinglePromptDrafter, SinglePromptDrafte
 from .nodes.wildcard_node import WildcardNode, WildcardNodeAPI
 from .nodes.prompt_combiner import PromptCombiner
 from .utils.file_manager import FileManager
-from .utils.wildcard_parser import WildcardParser
+
+# ComfyUI configures the root logger, so only a named logger is needed here
+log = logging.getLogger("PromptDrafter")
 
 # Extension directory
 EXTENSION_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -52,212 +56,125 @@ __version__ = "1.0.0"
 # API Routes for frontend communication
 # ============================================================================
 
-@PromptServer.instance.routes.post("/promptdrafter/dual/save")
-async def save_dual_prompt(request):
-    """Save a dual prompt combination."""
-    try:
-        data = await request.json()
-        name = data.get("name", "")
-        positive = data.get("positive", "")
-        negative = data.get("negative", "")
-        
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = DualPromptDrafterAPI.save_prompt(name, positive, negative)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/dual/load/{name}")
-async def load_dual_prompt(request):
-    """Load a dual prompt combination."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = DualPromptDrafterAPI.load_prompt(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/dual/list")
-async def list_dual_prompts(request):
-    """Get list of all saved dual prompts."""
-    try:
-        result = DualPromptDrafterAPI.list_prompts()
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.delete("/promptdrafter/dual/delete/{name}")
-async def delete_dual_prompt(request):
-    """Delete a saved dual prompt."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = DualPromptDrafterAPI.delete_prompt(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.post("/promptdrafter/single/save")
-async def save_single_prompt(request):
-    """Save a single prompt."""
-    try:
-        data = await request.json()
-        name = data.get("name", "")
-        prompt = data.get("prompt", "")
-        
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = SinglePromptDrafterAPI.save_prompt(name, prompt)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/single/load/{name}")
-async def load_single_prompt(request):
-    """Load a single prompt."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = SinglePromptDrafterAPI.load_prompt(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/single/list")
-async def list_single_prompts(request):
-    """Get list of all saved single prompts."""
-    try:
-        result = SinglePromptDrafterAPI.list_prompts()
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.delete("/promptdrafter/single/delete/{name}")
-async def delete_single_prompt(request):
-    """Delete a saved single prompt."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
+def _encoded_response(body):
+    """Build a JSON response from an already encoded body."""
+    return web.Response(body=body, content_type="application/json", charset="utf-8")
+
+
+def _json_route(handler):
+    """Wrap a route handler so its result, or any error, is sent as a JSON response."""
+    @functools.wraps(handler)
+    async def wrapper(request):
+        try:
+            result = await handler(request)
+            if isinstance(result, web.StreamResponse):
+                return result
+            return web.json_response(result)
+        except Exception as e:
+            return web.json_response({"success": False, "message": str(e)})
+    return wrapper
+
+
+def _extract(data, fields):
+    """Read fields from request data in one pass, defaulting missing ones to ""."""
+    return [data.get(field, "") for field in fields]
+
+
+def _register(method, path, fn, fields, required=()):
+    """
+    Register an API route that forwards request fields to an API method.
+    
+    Args:
+        method: HTTP method ('GET', 'POST' or 'DELETE')
+        path: Route path, may contain {name} segments
+        fn: API method called with the field values as positional arguments
+        fields: Field names read from the JSON body (POST) or the URL (GET/DELETE)
+        required: Field names that must be non-empty
+    """
+    # Encode the "<Field> is required" errors once, at registration
+    missing_bodies = {
+        field: json.dumps({"success": False, "message": f"{field.capitalize()} is required"}).encode("utf-8")
+        for field in required
+    }
+    
+    @_json_route
+    async def handler(request):
+        data = await request.json() if method == "POST" else request.match_info
+        args = _extract(data, fields)
         
-        result = SinglePromptDrafterAPI.delete_prompt(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.post("/promptdrafter/wildcard/save")
-async def save_wildcard(request):
-    """Save a wildcard list."""
-    try:
-        data = await request.json()
-        name = data.get("name", "")
-        raw_text = data.get("raw_text", "")
-        
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = WildcardNodeAPI.save_wildcard(name, raw_text)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/wildcard/load/{name}")
-async def load_wildcard(request):
-    """Load a wildcard list."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
-        
-        result = WildcardNodeAPI.load_wildcard(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.get("/promptdrafter/wildcard/list")
-async def list_wildcards(request):
-    """Get list of all saved wildcards."""
-    try:
-        result = WildcardNodeAPI.list_wildcards()
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.delete("/promptdrafter/wildcard/delete/{name}")
-async def delete_wildcard(request):
-    """Delete a saved wildcard."""
-    try:
-        name = request.match_info.get("name", "")
-        if not name:
-            return web.json_response({"success": False, "message": "Name is required"})
+        for field, value in zip(fields, args):
+            if field in missing_bodies and not value:
+                return _encoded_response(missing_bodies[field])
         
-        result = WildcardNodeAPI.delete_wildcard(name)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.post("/promptdrafter/wildcard/count")
-async def get_wildcard_count(request):
-    """Get the number of values in wildcard text."""
-    try:
-        data = await request.json()
-        raw_text = data.get("raw_text", "")
-        
-        result = WildcardNodeAPI.get_value_count(raw_text)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.post("/promptdrafter/wildcard/reset")
-async def reset_wildcard_sequential(request):
-    """Reset sequential index for a wildcard node."""
-    try:
-        data = await request.json()
-        unique_id = data.get("unique_id", "")
-        
-        result = WildcardNodeAPI.reset_sequential(unique_id)
-        return web.json_response(result)
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-@PromptServer.instance.routes.post("/promptdrafter/parse_wildcards")
-async def parse_wildcards_from_text(request):
-    """Parse wildcard names from prompt text."""
-    try:
-        data = await request.json()
-        text = data.get("text", "")
-        
-        wildcards = WildcardParser.extract_wildcard_names(text)
-        return web.json_response({
-            "success": True,
-            "wildcards": wildcards
-        })
-    except Exception as e:
-        return web.json_response({"success": False, "message": str(e)})
-
-
-print(f"[PromptDrafter] Loaded v{__version__}")
+        return fn(*args)
+    
+    PromptServer.instance.routes.route(method, path)(handler)
+
+
+# Encoded list responses: path -> (listing the body was built from, JSON bytes)
+_list_payloads = {}
+
+
+def _register_list(path, key, fn):
+    """
+    Register a GET route returning a saved item listing.
+    The API list methods use the cached listers, which return the same list
+    object until the folder changes, so the encoded body is reused until then.
+    
+    Args:
+        path: Route path
+        key: Response key holding the names
+        fn: API method returning the listing response
+    """
+    @_json_route
+    async def handler(request):
+        response = fn()
+        names = response[key]
+        cached = _list_payloads.get(path)
+        if cached is None or cached[0] is not names:
+            body = json.dumps(response).encode("utf-8")
+            cached = _list_payloads[path] = (names, body)
+        return _encoded_response(cached[1])
+    
+    PromptServer.instance.routes.get(path)(handler)
+
+
+# (method, path, api method, fields, required fields)
+ROUTES = [
+    # Dual prompts
+    ("POST", "/promptdrafter/dual/save", DualPromptDrafterAPI.save_prompt,
+     ("name", "positive", "negative"), ("name",)),
+    ("GET", "/promptdrafter/dual/load/{name}", DualPromptDrafterAPI.load_prompt, ("name",), ("name",)),
+    ("DELETE", "/promptdrafter/dual/delete/{name}", DualPromptDrafterAPI.delete_prompt, ("name",), ("name",)),
+    
+    # Single prompts
+    ("POST", "/promptdrafter/single/save", SinglePromptDrafterAPI.save_prompt, ("name", "prompt"), ("name",)),
+    ("GET", "/promptdrafter/single/load/{name}", SinglePromptDrafterAPI.load_prompt, ("name",), ("name",)),
+    ("DELETE", "/promptdrafter/single/delete/{name}", SinglePromptDrafterAPI.delete_prompt, ("name",), ("name",)),
+    
+    # Wildcards
+    ("POST", "/promptdrafter/wildcard/save", WildcardNodeAPI.save_wildcard, ("name", "raw_text"), ("name",)),
+    ("GET", "/promptdrafter/wildcard/load/{name}", WildcardNodeAPI.load_wildcard, ("name",), ("name",)),
+    ("DELETE", "/promptdrafter/wildcard/delete/{name}", WildcardNodeAPI.delete_wildcard, ("name",), ("name",)),
+    ("POST", "/promptdrafter/wildcard/count", WildcardNodeAPI.get_value_count, ("raw_text",)),
+    ("POST", "/promptdrafter/wildcard/reset", WildcardNodeAPI.reset_sequential, ("unique_id",)),
+    
+    # Prompt text helpers
+    ("POST", "/promptdrafter/parse_wildcards", WildcardNodeAPI.parse_wildcards, ("text",)),
+]
+
+# (path, response key, api method)
+LIST_ROUTES = [
+    ("/promptdrafter/dual/list", "prompts", DualPromptDrafterAPI.list_prompts),
+    ("/promptdrafter/single/list", "prompts", SinglePromptDrafterAPI.list_prompts),
+    ("/promptdrafter/wildcard/list", "wildcards", WildcardNodeAPI.list_wildcards),
+]
+
+for route in ROUTES:
+    _register(*route)
+
+for route in LIST_ROUTES:
+    _register_list(*route)
+
+
+log.info("[PromptDrafter] Loaded v%s", __version__)
@@ -1,6 +1,20 @@
+import threading
+
 from .dual_prompt_drafter import DualPromptDrafter
 from .single_prompt_drafter import SinglePromptDrafter
 from .wildcard_node import WildcardNode
 from .prompt_combiner import PromptCombiner
+from ..utils.file_manager import FileManager
 
 __all__ = ['DualPromptDrafter', 'SinglePromptDrafter', 'WildcardNode', 'PromptCombiner']
+
+
+def _warm_listing_cache():
+    """Scan the save folders so the first INPUT_TYPES call hits the cache."""
+    FileManager.list_dual_prompts_cached()
+    FileManager.list_single_prompts_cached()
+    FileManager.list_wildcards_cached()
+
+
+# Overlap the folder scan with the rest of ComfyUI's startup
+threading.Thread(target=_warm_listing_cache, daemon=True).start()
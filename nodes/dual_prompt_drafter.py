@@ -8,6 +8,10 @@ from ..utils.wildcard_parser import WildcardParser
 from ..utils.text_processor import TextProcessor
 
 
+# Returned from IS_CHANGED to force re-execution (NaN never compares equal)
+_NAN = float("nan")
+
+
 class DualPromptDrafter:
     """
     A node for drafting both positive and negative prompts with wildcard support.
@@ -26,62 +30,72 @@ class DualPromptDrafter:
     RETURN_NAMES = ("positive_prompt", "negative_prompt")
     OUTPUT_NODE = False
     
+    # No per-instance state, so skip the instance __dict__
+    __slots__ = ()
+    
     # Class variable to track sequential wildcard indices (memory-based, resets on restart)
     _wildcard_indices = {}
     
+    # Static input definitions, built once; INPUT_TYPES only adds the saved prompt dropdown
+    _REQUIRED_INPUTS = {
+        "positive_prompt": ("STRING", {
+            "multiline": True,
+            "default": "",
+            "placeholder": "Enter positive prompt...\nUse {wildcard_name} for wildcards"
+        }),
+        "negative_prompt": ("STRING", {
+            "multiline": True,
+            "default": "",
+            "placeholder": "Enter negative prompt...\nUse {wildcard_name} for wildcards"
+        }),
+    }
+    _OPTIONAL_INPUTS = {
+        "positive_prefix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "positive_suffix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "negative_prefix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "negative_suffix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "prompt_name": ("STRING", {
+            "default": "",
+            "placeholder": "Name for saving/loading"
+        }),
+    }
+    _HIDDEN_INPUTS = {
+        "unique_id": "UNIQUE_ID"
+    }
+    
     @classmethod
     def INPUT_TYPES(cls):
         # Get list of saved prompts for the dropdown
-        saved_prompts = FileManager.list_dual_prompts()
-        saved_prompts_list = [""] + saved_prompts if saved_prompts else [""]
+        saved_prompts = FileManager.list_dual_prompts_cached()
+        saved_prompts_list = ["", *saved_prompts]
         
         return {
-            "required": {
-                "positive_prompt": ("STRING", {
-                    "multiline": True,
-                    "default": "",
-                    "placeholder": "Enter positive prompt...\nUse {wildcard_name} for wildcards"
-                }),
-                "negative_prompt": ("STRING", {
-                    "multiline": True,
-                    "default": "",
-                    "placeholder": "Enter negative prompt...\nUse {wildcard_name} for wildcards"
-                }),
-            },
+            "required": cls._REQUIRED_INPUTS,
             "optional": {
-                "positive_prefix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "positive_suffix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "negative_prefix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "negative_suffix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "prompt_name": ("STRING", {
-                    "default": "",
-                    "placeholder": "Name for saving/loading"
-                }),
+                **cls._OPTIONAL_INPUTS,
                 "load_prompt": (saved_prompts_list, {
                     "default": ""
                 }),
             },
-            "hidden": {
-                "unique_id": "UNIQUE_ID"
-            }
+            "hidden": cls._HIDDEN_INPUTS
         }
     
     @classmethod
     def IS_CHANGED(cls, **kwargs):
         """Force re-execution when inputs change."""
-        return float("nan")
+        return _NAN
     
     def process(
         self,
@@ -115,31 +129,27 @@ class DualPromptDrafter:
             Tuple of (processed_positive, processed_negative)
         """
         # Collect wildcard values from kwargs
-        wildcard_values = {}
-        for key, value in kwargs.items():
-            if key.startswith("wildcard_"):
-                wildcard_values[key] = value
+        wildcard_values = {key: value for key, value in kwargs.items() if key.startswith("wildcard_")}
         
-        # Process positive prompt
-        processed_positive = TextProcessor.process_prompt(
+        # Look the method up once for both prompts
+        process_and_clean = TextProcessor.process_and_clean
+        
+        # Process and clean positive prompt
+        processed_positive = process_and_clean(
             text=positive_prompt,
             prefix=positive_prefix,
             suffix=positive_suffix,
             wildcard_values=wildcard_values
         )
         
-        # Process negative prompt
-        processed_negative = TextProcessor.process_prompt(
+        # Process and clean negative prompt
+        processed_negative = process_and_clean(
             text=negative_prompt,
             prefix=negative_prefix,
             suffix=negative_suffix,
             wildcard_values=wildcard_values
         )
         
-        # Clean up the prompts
-        processed_positive = TextProcessor.clean_prompt(processed_positive)
-        processed_negative = TextProcessor.clean_prompt(processed_negative)
-        
         return (processed_positive, processed_negative)
     
     @classmethod
@@ -188,7 +198,7 @@ class DualPromptDrafterAPI:
     @staticmethod
     def list_prompts() -> dict:
         """Get list of all saved dual prompts."""
-        prompts = FileManager.list_dual_prompts()
+        prompts = FileManager.list_dual_prompts_cached()
         return {
             "success": True,
             "prompts": prompts
@@ -9,6 +9,9 @@ from ..utils.text_processor import TextProcessor
 # Maximum number of inputs supported
 MAX_INPUTS = 25
 
+# Returned from IS_CHANGED to force re-execution (NaN never compares equal)
+_NAN = float("nan")
+
 
 class PromptCombiner:
     """
@@ -28,56 +31,61 @@ class PromptCombiner:
     RETURN_NAMES = ("combined",)
     OUTPUT_NODE = False
     
-    @classmethod
-    def INPUT_TYPES(cls):
-        inputs = {
-            "required": {
-                "input_count": ("INT", {
-                    "default": 2,
-                    "min": 2,
-                    "max": MAX_INPUTS,
-                    "step": 1,
-                    "display": "number"
-                }),
-            },
-            "optional": {}
-        }
-        
-        # Add 25 optional string inputs
-        for i in range(1, MAX_INPUTS + 1):
-            inputs["optional"][f"string_{i}"] = ("STRING", {
+    # No per-instance state, so skip the instance __dict__
+    __slots__ = ()
+    
+    # Input names, built once instead of formatted on every call
+    _KEYS = tuple(f"string_{i}" for i in range(1, MAX_INPUTS + 1))
+    
+    # Static input definition, built once and returned as-is by INPUT_TYPES
+    _INPUT_TYPES = {
+        "required": {
+            "input_count": ("INT", {
+                "default": 2,
+                "min": 2,
+                "max": MAX_INPUTS,
+                "step": 1,
+                "display": "number"
+            }),
+        },
+        # 25 optional string inputs
+        "optional": {
+            key: ("STRING", {
                 "forceInput": True,
                 "default": ""
             })
-        
-        return inputs
+            for key in _KEYS
+        }
+    }
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return cls._INPUT_TYPES
     
     @classmethod
     def IS_CHANGED(cls, **kwargs):
         """Always re-execute to ensure fresh output."""
-        return float("nan")
+        return _NAN
     
     def process(self, input_count: int = 2, **kwargs):
         """
         Combine input strings with smart comma handling.
         
         Args:
-            input_count: Number of inputs to consider (for UI, backend processes all)
+            input_count: Number of inputs to combine; slots above it are hidden
+                         in the UI and deliberately ignored
             **kwargs: string_1 through string_25
             
         Returns:
             Tuple containing the combined string
         """
-        # Collect all non-empty string inputs
-        strings = []
-        
-        for i in range(1, MAX_INPUTS + 1):
-            key = f"string_{i}"
-            value = kwargs.get(key, "")
-            if value and value.strip():
-                strings.append(value)
+        # Collect the non-empty inputs among the first input_count slots
+        strings = [
+            value for key in self._KEYS[:input_count]
+            if (value := kwargs.get(key)) and not value.isspace()
+        ]
         
         # Combine using smart comma handling
-        result = TextProcessor.combine_strings(*strings)
+        result = TextProcessor.combine_strings_iter(strings)
         
         return (result,)
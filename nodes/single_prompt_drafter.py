@@ -8,6 +8,10 @@ from ..utils.wildcard_parser import WildcardParser
 from ..utils.text_processor import TextProcessor
 
 
+# Returned from IS_CHANGED to force re-execution (NaN never compares equal)
+_NAN = float("nan")
+
+
 class SinglePromptDrafter:
     """
     A node for drafting a single prompt with wildcard support.
@@ -26,46 +30,56 @@ class SinglePromptDrafter:
     RETURN_NAMES = ("prompt",)
     OUTPUT_NODE = False
     
+    # No per-instance state, so skip the instance __dict__
+    __slots__ = ()
+    
+    # Static input definitions, built once; INPUT_TYPES only adds the saved prompt dropdown
+    _REQUIRED_INPUTS = {
+        "prompt": ("STRING", {
+            "multiline": True,
+            "default": "",
+            "placeholder": "Enter prompt...\nUse {wildcard_name} for wildcards"
+        }),
+    }
+    _OPTIONAL_INPUTS = {
+        "prefix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "suffix": ("STRING", {
+            "forceInput": True,
+            "default": ""
+        }),
+        "prompt_name": ("STRING", {
+            "default": "",
+            "placeholder": "Name for saving/loading"
+        }),
+    }
+    _HIDDEN_INPUTS = {
+        "unique_id": "UNIQUE_ID"
+    }
+    
     @classmethod
     def INPUT_TYPES(cls):
         # Get list of saved prompts for the dropdown
-        saved_prompts = FileManager.list_single_prompts()
-        saved_prompts_list = [""] + saved_prompts if saved_prompts else [""]
+        saved_prompts = FileManager.list_single_prompts_cached()
+        saved_prompts_list = ["", *saved_prompts]
         
         return {
-            "required": {
-                "prompt": ("STRING", {
-                    "multiline": True,
-                    "default": "",
-                    "placeholder": "Enter prompt...\nUse {wildcard_name} for wildcards"
-                }),
-            },
+            "required": cls._REQUIRED_INPUTS,
             "optional": {
-                "prefix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "suffix": ("STRING", {
-                    "forceInput": True,
-                    "default": ""
-                }),
-                "prompt_name": ("STRING", {
-                    "default": "",
-                    "placeholder": "Name for saving/loading"
-                }),
+                **cls._OPTIONAL_INPUTS,
                 "load_prompt": (saved_prompts_list, {
                     "default": ""
                 }),
             },
-            "hidden": {
-                "unique_id": "UNIQUE_ID"
-            }
+            "hidden": cls._HIDDEN_INPUTS
         }
     
     @classmethod
     def IS_CHANGED(cls, **kwargs):
         """Force re-execution when inputs change."""
-        return float("nan")
+        return _NAN
     
     def process(
         self,
@@ -93,22 +107,16 @@ class SinglePromptDrafter:
             Tuple containing the processed prompt
         """
         # Collect wildcard values from kwargs
-        wildcard_values = {}
-        for key, value in kwargs.items():
-            if key.startswith("wildcard_"):
-                wildcard_values[key] = value
+        wildcard_values = {key: value for key, value in kwargs.items() if key.startswith("wildcard_")}
         
-        # Process prompt
-        processed = TextProcessor.process_prompt(
+        # Process and clean prompt
+        processed = TextProcessor.process_and_clean(
             text=prompt,
             prefix=prefix,
             suffix=suffix,
             wildcard_values=wildcard_values
         )
         
-        # Clean up the prompt
-        processed = TextProcessor.clean_prompt(processed)
-        
         return (processed,)
     
     @classmethod
@@ -156,7 +164,7 @@ class SinglePromptDrafterAPI:
     @staticmethod
     def list_prompts() -> dict:
         """Get list of all saved single prompts."""
-        prompts = FileManager.list_single_prompts()
+        prompts = FileManager.list_single_prompts_cached()
         return {
             "success": True,
             "prompts": prompts
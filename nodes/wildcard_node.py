@@ -9,6 +9,56 @@ from ..utils.file_manager import FileManager
 from ..utils.wildcard_parser import WildcardParser
 
 
+# Returned from IS_CHANGED to force re-execution (NaN never compares equal)
+_NAN = float("nan")
+
+# Output modes that pick a new value on every execution
+_VOLATILE_MODES = frozenset(("random", "sequential"))
+
+
+# Output mode handlers, called as handler(values, fixed_index, unique_id)
+def _output_csv(values, fixed_index, unique_id):
+    """Return all values as a comma-separated list."""
+    return ", ".join(values)
+
+
+def _output_dynamic_prompts(values, fixed_index, unique_id):
+    """Return all values in Dynamic Prompts format: {opt1|opt2|opt3}."""
+    return WildcardParser.format_as_dynamic_prompts(values)
+
+
+def _output_fixed(values, fixed_index, unique_id):
+    """Return the value at fixed_index, clamped to the valid range."""
+    return values[max(0, min(fixed_index, len(values) - 1))]
+
+
+def _output_sequential(values, fixed_index, unique_id):
+    """Return the next value in this node's sequence (nodes start at index 0)."""
+    node_key = f"wildcard_{unique_id}"
+    count = len(values)
+    
+    index = WildcardNode._sequential_indices.get(node_key, 0) % count
+    
+    # Increment for next execution
+    WildcardNode._sequential_indices[node_key] = (index + 1) % count
+    
+    return values[index]
+
+
+def _output_random(values, fixed_index, unique_id):
+    """Return a randomly selected value."""
+    return values[WildcardNode._rng.randrange(len(values))]
+
+
+_MODE_HANDLERS = {
+    "list (csv)": _output_csv,
+    "dynamic_prompts": _output_dynamic_prompts,
+    "fixed": _output_fixed,
+    "sequential": _output_sequential,
+    "random": _output_random,
+}
+
+
 class WildcardNode:
     """
     A node for creating wildcard value lists.
@@ -35,11 +85,17 @@ class WildcardNode:
     # Class variable to track sequential indices (memory-based, resets on ComfyUI restart)
     _sequential_indices = {}
     
+    # Last parsed values per node: unique_id -> (wildcard_values text, parsed values tuple)
+    _parse_cache = {}
+    
+    # Private generator for random mode, independent of the global random state
+    _rng = random.Random()
+    
     @classmethod
     def INPUT_TYPES(cls):
         # Get list of saved wildcards for the dropdown
-        saved_wildcards = FileManager.list_wildcards()
-        saved_wildcards_list = [""] + saved_wildcards if saved_wildcards else [""]
+        saved_wildcards = FileManager.list_wildcards_cached()
+        saved_wildcards_list = ["", *saved_wildcards]
         
         return {
             "required": {
@@ -79,8 +135,8 @@ class WildcardNode:
         Control when the node re-executes.
         Random and sequential modes should always re-execute.
         """
-        if output_mode in ["random", "sequential"]:
-            return float("nan")  # Always re-execute
+        if output_mode in _VOLATILE_MODES:
+            return _NAN  # Always re-execute
         return ""  # Use default caching for fixed and dynamic_prompts
     
     def process(
@@ -106,47 +162,20 @@ class WildcardNode:
         Returns:
             Tuple containing the selected/formatted wildcard value
         """
-        # Parse the values
-        values = WildcardParser.parse_value_list(wildcard_values)
+        # Parse the values, reusing this node's last parse while its text is unchanged
+        cached = WildcardNode._parse_cache.get(unique_id)
+        if cached is not None and cached[0] == wildcard_values:
+            values = cached[1]
+        else:
+            values = WildcardParser.parse_value_tuple(wildcard_values)
+            WildcardNode._parse_cache[unique_id] = (wildcard_values, values)
         
         if not values:
             return ("",)
         
-        # Process based on output mode
-        if output_mode == "list (csv)":
-            # Return as comma-separated list
-            result = ", ".join(values)
-            return (result,)
-        
-        elif output_mode == "dynamic_prompts":
-            # Return in Dynamic Prompts format: {opt1|opt2|opt3}
-            result = WildcardParser.format_as_dynamic_prompts(values)
-            return (result,)
-        
-        elif output_mode == "fixed":
-            # Return value at specific index (clamped to valid range)
-            index = max(0, min(fixed_index, len(values) - 1))
-            return (values[index],)
-        
-        elif output_mode == "sequential":
-            # Get next value in sequence
-            node_key = f"wildcard_{unique_id}"
-            
-            if node_key not in WildcardNode._sequential_indices:
-                WildcardNode._sequential_indices[node_key] = 0
-            
-            index = WildcardNode._sequential_indices[node_key] % len(values)
-            result = values[index]
-            
-            # Increment for next execution
-            WildcardNode._sequential_indices[node_key] = (index + 1) % len(values)
-            
-            return (result,)
-        
-        else:  # random (default)
-            # Randomly select a value
-            result = random.choice(values)
-            return (result,)
+        # Dispatch on output mode; unknown modes fall back to random
+        handler = _MODE_HANDLERS.get(output_mode, _output_random)
+        return (handler(values, fixed_index, unique_id),)
     
     @classmethod
     def get_value_count(cls, wildcard_values: str) -> int:
@@ -187,8 +216,7 @@ class WildcardNodeAPI:
     @staticmethod
     def save_wildcard(name: str, raw_text: str) -> dict:
         """Save a wildcard list."""
-        values = WildcardParser.parse_value_list(raw_text)
-        success = FileManager.save_wildcard(name, raw_text, values)
+        success = FileManager.save_wildcard(name, raw_text)
         return {
             "success": success,
             "message": f"Saved wildcard '{name}'" if success else f"Failed to save wildcard '{name}'"
@@ -199,6 +227,9 @@ class WildcardNodeAPI:
         """Load a wildcard list."""
         data = FileManager.load_wildcard(name)
         if data:
+            # Values are parsed from the raw text unless the save only lists values
+            if "values" not in data:
+                data["values"] = WildcardParser.parse_value_list(data["raw_text"])
             return {
                 "success": True,
                 "data": data
@@ -211,7 +242,7 @@ class WildcardNodeAPI:
     @staticmethod
     def list_wildcards() -> dict:
         """Get list of all saved wildcards."""
-        wildcards = FileManager.list_wildcards()
+        wildcards = FileManager.list_wildcards_cached()
         return {
             "success": True,
             "wildcards": wildcards
@@ -243,3 +274,12 @@ class WildcardNodeAPI:
             "success": True,
             "message": "Sequential index reset"
         }
+    
+    @staticmethod
+    def parse_wildcards(text: str) -> dict:
+        """Parse wildcard names from prompt text."""
+        wildcards = WildcardParser.extract_wildcard_names(text)
+        return {
+            "success": True,
+            "wildcards": wildcards
+        }
@@ -1,5 +1,24 @@
-from .file_manager import FileManager
-from .wildcard_parser import WildcardParser
-from .text_processor import TextProcessor
+import importlib
 
 __all__ = ['FileManager', 'WildcardParser', 'TextProcessor']
+
+# Submodule that provides each public name, imported on first access
+_SUBMODULES = {
+    'FileManager': '.file_manager',
+    'WildcardParser': '.wildcard_parser',
+    'TextProcessor': '.text_processor',
+}
+
+
+def __getattr__(name):
+    """Import the submodule providing a public name on first access (PEP 562)."""
+    module_name = _SUBMODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,26 +5,43 @@ Handles saving and loading of prompts and wildcards as JSON files.
 
 import os
 import json
+import functools
+import threading
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 
 # Get the directory where this file is located
 EXTENSION_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_PATH = os.path.join(EXTENSION_DIR, "config.json")
 
+# Characters that are invalid in filenames, mapped to underscores
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+# Shared decoder for reading saves and the config file
+_DECODER = json.JSONDecoder()
+
+# Per-folder index of display names: filename stem -> name as entered.
+# _sanitize_filename strips leading dots, so no save can collide with it.
+_INDEX_FILENAME = ".index.json"
+
 
 class FileManager:
     """Manages file operations for saving/loading prompts and wildcards."""
     
     _config_cache: Optional[Dict[str, Any]] = None
     
+    # Resolved save directories: category -> absolute path (cleared by reload_config)
+    _resolved_paths: Dict[str, str] = {}
+    
+    # Directory listing cache: directory path -> (st_mtime_ns, sorted names)
+    _dir_cache: Dict[str, Tuple[int, List[str]]] = {}
+    
     @classmethod
     def get_config(cls) -> Dict[str, Any]:
         """Load and cache the configuration file."""
         if cls._config_cache is None:
             if os.path.exists(CONFIG_PATH):
-                with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-                    cls._config_cache = json.load(f)
+                cls._config_cache = cls._read_json(CONFIG_PATH)
             else:
                 # Default configuration
                 cls._config_cache = {
@@ -44,6 +61,7 @@ class FileManager:
     def reload_config(cls) -> Dict[str, Any]:
         """Force reload the configuration file."""
         cls._config_cache = None
+        cls._resolved_paths.clear()
         return cls.get_config()
     
     @classmethod
@@ -57,13 +75,19 @@ class FileManager:
         Returns:
             Full path to the save directory
         """
+        path = cls._resolved_paths.get(category)
+        if path is not None:
+            return path
+        
         config = cls.get_config()
-        relative_path = config.get("save_paths", {}).get(category, f"saved/{category}")
+        path = config.get("save_paths", {}).get(category, f"saved/{category}")
         
         # If path is relative, make it relative to extension directory
-        if not os.path.isabs(relative_path):
-            return os.path.join(EXTENSION_DIR, relative_path)
-        return relative_path
+        if not os.path.isabs(path):
+            path = os.path.join(EXTENSION_DIR, path)
+        
+        cls._resolved_paths[category] = path
+        return path
     
     @classmethod
     def ensure_directory(cls, category: str) -> str:
@@ -98,9 +122,9 @@ class FileManager:
                 "type": "dual_prompt"
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            cls._write_json(filepath, data)
+            cls._record_name(directory, filename, name)
+            cls._invalidate_listing(directory)
             return True
         except Exception as e:
             print(f"[PromptDrafter] Error saving dual prompt: {e}")
@@ -122,17 +146,15 @@ class FileManager:
             filename = cls._sanitize_filename(name) + ".json"
             filepath = os.path.join(directory, filename)
             
-            if not os.path.exists(filepath):
-                return None
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = cls._read_json(filepath)
             
             return {
                 "name": data.get("name", name),
                 "positive": data.get("positive", ""),
                 "negative": data.get("negative", "")
             }
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"[PromptDrafter] Error loading dual prompt: {e}")
             return None
@@ -142,6 +164,11 @@ class FileManager:
         """Get list of all saved dual prompt names."""
         return cls._list_saves("dual_prompts")
     
+    @classmethod
+    def list_dual_prompts_cached(cls) -> List[str]:
+        """Get list of saved dual prompt names, rescanning only when the folder changed."""
+        return cls._list_saves_cached("dual_prompts")
+    
     @classmethod
     def delete_dual_prompt(cls, name: str) -> bool:
         """Delete a saved dual prompt."""
@@ -171,9 +198,9 @@ class FileManager:
                 "type": "single_prompt"
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            cls._write_json(filepath, data)
+            cls._record_name(directory, filename, name)
+            cls._invalidate_listing(directory)
             return True
         except Exception as e:
             print(f"[PromptDrafter] Error saving single prompt: {e}")
@@ -195,16 +222,14 @@ class FileManager:
             filename = cls._sanitize_filename(name) + ".json"
             filepath = os.path.join(directory, filename)
             
-            if not os.path.exists(filepath):
-                return None
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = cls._read_json(filepath)
             
             return {
                 "name": data.get("name", name),
                 "prompt": data.get("prompt", "")
             }
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"[PromptDrafter] Error loading single prompt: {e}")
             return None
@@ -214,20 +239,25 @@ class FileManager:
         """Get list of all saved single prompt names."""
         return cls._list_saves("single_prompts")
     
+    @classmethod
+    def list_single_prompts_cached(cls) -> List[str]:
+        """Get list of saved single prompt names, rescanning only when the folder changed."""
+        return cls._list_saves_cached("single_prompts")
+    
     @classmethod
     def delete_single_prompt(cls, name: str) -> bool:
         """Delete a saved single prompt."""
         return cls._delete_save("single_prompts", name)
     
     @classmethod
-    def save_wildcard(cls, name: str, raw_text: str, values: List[str]) -> bool:
+    def save_wildcard(cls, name: str, raw_text: str) -> bool:
         """
         Save a wildcard list.
+        Only the raw text is stored; values are parsed from it when needed.
         
         Args:
             name: Name for the wildcard
             raw_text: Original text as entered by user
-            values: Parsed list of values
             
         Returns:
             True if save was successful
@@ -240,14 +270,13 @@ class FileManager:
             data = {
                 "name": name,
                 "raw_text": raw_text,
-                "values": values,
                 "created": datetime.now().isoformat(),
                 "type": "wildcard"
             }
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            
+            cls._write_json(filepath, data)
+            cls._record_name(directory, filename, name)
+            cls._invalidate_listing(directory)
             return True
         except Exception as e:
             print(f"[PromptDrafter] Error saving wildcard: {e}")
@@ -262,24 +291,26 @@ class FileManager:
             name: Name of the wildcard to load
             
         Returns:
-            Dictionary with 'raw_text' and 'values' keys, or None if not found
+            Dictionary with 'name' and 'raw_text' keys (plus the stored 'values'
+            for saves without raw text), or None if not found
         """
         try:
             directory = cls.get_save_path("wildcards")
             filename = cls._sanitize_filename(name) + ".json"
             filepath = os.path.join(directory, filename)
             
-            if not os.path.exists(filepath):
-                return None
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = cls._read_json(filepath)
             
-            return {
+            result = {
                 "name": data.get("name", name),
-                "raw_text": data.get("raw_text", ""),
-                "values": data.get("values", [])
+                "raw_text": data.get("raw_text", "")
             }
+            if "raw_text" not in data:
+                # Hand-made saves may only list the values; return them as stored
+                result["values"] = data.get("values", [])
+            return result
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"[PromptDrafter] Error loading wildcard: {e}")
             return None
@@ -289,37 +320,161 @@ class FileManager:
         """Get list of all saved wildcard names."""
         return cls._list_saves("wildcards")
     
+    @classmethod
+    def list_wildcards_cached(cls) -> List[str]:
+        """Get list of saved wildcard names, rescanning only when the folder changed."""
+        return cls._list_saves_cached("wildcards")
+    
     @classmethod
     def delete_wildcard(cls, name: str) -> bool:
         """Delete a saved wildcard."""
         return cls._delete_save("wildcards", name)
     
+    @classmethod
+    def _iter_saves(cls, category: str) -> Iterator[str]:
+        """
+        Yield the filename stems of saved items in a category, in directory order.
+        A stem is the sanitized name that load and delete look the file up by.
+        
+        Args:
+            category: One of 'dual_prompts', 'single_prompts', 'wildcards'
+            
+        Yields:
+            Filename stems
+        """
+        directory = cls.get_save_path(category)
+        if not os.path.exists(directory):
+            return
+        
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.json') and name != _INDEX_FILENAME and entry.is_file():
+                    yield name[:-5]
+    
     @classmethod
     def _list_saves(cls, category: str) -> List[str]:
-        """Get list of all saved items in a category."""
+        """
+        Get sorted list of all saved items in a category.
+        Display names come from the folder's name index, which save and delete
+        keep current, so a rescan reads one file; only saves missing from the
+        index (older or hand-made files) are opened. Listing never writes.
+        
+        Args:
+            category: One of 'dual_prompts', 'single_prompts', 'wildcards'
+            
+        Returns:
+            Sorted list of saved names
+        """
         try:
             directory = cls.get_save_path(category)
-            if not os.path.exists(directory):
-                return []
+            index = cls._read_index(directory)
             
+            sanitize = cls._sanitize_filename
             names = []
-            for filename in os.listdir(directory):
-                if filename.endswith('.json'):
-                    # Try to read the name from the file
-                    try:
-                        filepath = os.path.join(directory, filename)
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                        names.append(data.get("name", filename[:-5]))
-                    except:
-                        # Fall back to filename without extension
-                        names.append(filename[:-5])
+            for stem in cls._iter_saves(category):
+                name = index.get(stem)
+                if not isinstance(name, str):
+                    name = cls._read_saved_name(os.path.join(directory, stem + ".json"), stem)
+                # Show the stored name only if load/delete resolve it to this file
+                # (a renamed file keeps its old name inside)
+                names.append(name if sanitize(name) == stem else stem)
             
             return sorted(names)
         except Exception as e:
             print(f"[PromptDrafter] Error listing {category}: {e}")
             return []
     
+    @classmethod
+    def _list_saves_cached(cls, category: str) -> List[str]:
+        """
+        Get list of saved items in a category, cached on the directory mtime.
+        The returned list is shared between callers and must not be modified.
+        
+        Args:
+            category: One of 'dual_prompts', 'single_prompts', 'wildcards'
+            
+        Returns:
+            Sorted list of saved names
+        """
+        directory = cls.get_save_path(category)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return []
+        
+        cached = cls._dir_cache.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        names = cls._list_saves(category)
+        cls._dir_cache[directory] = (mtime, names)
+        return names
+    
+    @classmethod
+    def _invalidate_listing(cls, directory: str):
+        """
+        Drop the cached listing for a directory.
+        Overwriting an existing file does not change the directory mtime,
+        so writes and deletes invalidate explicitly.
+        """
+        cls._dir_cache.pop(directory, None)
+    
+    @classmethod
+    def _record_name(cls, directory: str, filename: str, name: str):
+        """
+        Store the display name of a save in its folder's name index.
+        
+        Args:
+            directory: Save directory
+            filename: Filename the save was written to
+            name: Name as entered by the user
+        """
+        stem = filename[:-5]
+        index = cls._read_index(directory)
+        if index.get(stem) != name:
+            index[stem] = name
+            cls._write_index(directory, index)
+    
+    @classmethod
+    def _forget_name(cls, directory: str, filename: str):
+        """
+        Remove a deleted save from its folder's name index.
+        
+        Args:
+            directory: Save directory
+            filename: Filename of the deleted save
+        """
+        index = cls._read_index(directory)
+        if index.pop(filename[:-5], None) is not None:
+            cls._write_index(directory, index)
+    
+    @classmethod
+    def _read_index(cls, directory: str) -> Dict[str, str]:
+        """Read a folder's name index, or an empty one if it is missing or unreadable."""
+        try:
+            index = cls._read_json(os.path.join(directory, _INDEX_FILENAME))
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+    
+    @classmethod
+    def _write_index(cls, directory: str, index: Dict[str, str]):
+        """Write a folder's name index; failures only mean the listing opens the affected saves."""
+        try:
+            cls._write_json(os.path.join(directory, _INDEX_FILENAME), index)
+        except OSError as e:
+            print(f"[PromptDrafter] Error writing name index in {directory}: {e}")
+    
+    @classmethod
+    def _read_saved_name(cls, filepath: str, stem: str) -> str:
+        """Read the stored name of a save, falling back to its filename stem."""
+        try:
+            name = cls._read_json(filepath).get("name", stem)
+        except Exception:
+            return stem
+        return name if isinstance(name, str) and name else stem
+    
     @classmethod
     def _delete_save(cls, category: str, name: str) -> bool:
         """Delete a saved item."""
@@ -328,15 +483,60 @@ class FileManager:
             filename = cls._sanitize_filename(name) + ".json"
             filepath = os.path.join(directory, filename)
             
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                return True
+            os.remove(filepath)
+            cls._forget_name(directory, filename)
+            cls._invalidate_listing(directory)
+            return True
+        except FileNotFoundError:
             return False
         except Exception as e:
             print(f"[PromptDrafter] Error deleting {category}/{name}: {e}")
             return False
     
     @staticmethod
+    def _read_json(filepath: str) -> Any:
+        """
+        Read and decode a JSON file.
+        Reads the whole file in one call and decodes it with a shared
+        decoder rather than going through json.load().
+        
+        Args:
+            filepath: Path of the file to read
+            
+        Returns:
+            The decoded JSON data
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return _DECODER.decode(f.read())
+    
+    @staticmethod
+    def _write_json(filepath: str, data: Dict[str, Any]):
+        """
+        Write data as compact JSON, atomically replacing any existing file.
+        json.dumps() with no indent goes through the C encoder (json.dump()
+        never does), and writing to a temporary file first means a crash
+        cannot leave a truncated save behind. The temporary name is unique
+        per process and thread, so concurrent writers of the same file don't
+        clobber each other's temporary file.
+        
+        Args:
+            filepath: Destination path
+            data: JSON-serializable data
+        """
+        tmp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _sanitize_filename(name: str) -> str:
         """
         Sanitize a name for use as a filename.
@@ -347,14 +547,9 @@ class FileManager:
         Returns:
             A safe filename string
         """
-        # Replace invalid characters with underscores
-        invalid_chars = '<>:"/\\|?*'
-        result = name
-        for char in invalid_chars:
-            result = result.replace(char, '_')
-        
-        # Remove leading/trailing spaces and dots
-        result = result.strip(' .')
+        # Replace invalid characters with underscores, then remove
+        # leading/trailing spaces and dots
+        result = name.translate(_SANITIZE_TABLE).strip(' .')
         
         # Ensure it's not empty
         if not result:
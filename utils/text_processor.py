@@ -3,13 +3,24 @@ Text Processor for ComfyUI-PromptDrafter
 Handles combining prefix/suffix with prompts and wildcard replacement.
 """
 
-from typing import Optional, Dict
+import re
+import functools
+from typing import Optional, Dict, Iterable, Tuple
 from .wildcard_parser import WildcardParser
 
 
+@functools.lru_cache(maxsize=256)
+def _extract_wildcard_names(text: str) -> Tuple[str, ...]:
+    """Memoized WildcardParser.extract_wildcard_names, as a tuple so cached results can be shared."""
+    return tuple(WildcardParser.extract_wildcard_names(text))
+
+
 class TextProcessor:
     """Processes prompt text with prefix/suffix and wildcard replacement."""
     
+    # Pattern used by clean_prompt, compiled once
+    _MULTISPACE_PATTERN = re.compile(r' {2,}')
+    
     @classmethod
     def _strip_commas(cls, text: str) -> str:
         """
@@ -50,19 +61,17 @@ class TextProcessor:
         Returns:
             Combined prompt string
         """
-        parts = []
-        
-        # Clean each part - strip commas from edges to prevent doubling
-        if prefix and prefix.strip():
-            parts.append(cls._strip_commas(prefix))
-        
-        if text and text.strip():
-            parts.append(cls._strip_commas(text))
+        # Common case: no prefix/suffix connected, nothing to join
+        if not prefix and not suffix:
+            return cls._strip_commas(text)
         
-        if suffix and suffix.strip():
-            parts.append(cls._strip_commas(suffix))
-        
-        return separator.join(parts)
+        # Clean each part - strip commas from edges to prevent doubling,
+        # and drop parts that are empty once cleaned
+        strip_commas = cls._strip_commas
+        return separator.join([
+            cleaned for cleaned in (strip_commas(part) for part in (prefix, text, suffix))
+            if cleaned
+        ])
     
     @classmethod
     def combine_strings(cls, *strings: str, separator: str = ", ") -> str:
@@ -77,15 +86,27 @@ class TextProcessor:
         Returns:
             Combined string with proper separators
         """
-        parts = []
-        
-        for s in strings:
-            if s and s.strip():
-                cleaned = cls._strip_commas(s)
-                if cleaned:  # Only add if there's content after cleaning
-                    parts.append(cleaned)
+        return cls.combine_strings_iter(strings, separator)
+    
+    @classmethod
+    def combine_strings_iter(cls, strings: Iterable[str], separator: str = ", ") -> str:
+        """
+        Combine an iterable of strings with smart comma handling.
+        Same as combine_strings, without packing the inputs into an argument tuple.
         
-        return separator.join(parts)
+        Args:
+            strings: Strings to combine
+            separator: Separator to use between parts (default: ", ")
+            
+        Returns:
+            Combined string with proper separators
+        """
+        # _strip_commas returns "" for blank input, so one check covers both cases
+        strip_commas = cls._strip_commas
+        return separator.join([
+            cleaned for cleaned in (strip_commas(s) for s in strings if s)
+            if cleaned
+        ])
     
     @classmethod
     def process_prompt(
@@ -118,6 +139,38 @@ class TextProcessor:
         
         return combined
     
+    @classmethod
+    def process_and_clean(
+        cls,
+        text: str,
+        prefix: Optional[str] = None,
+        suffix: Optional[str] = None,
+        wildcard_values: Optional[Dict[str, str]] = None,
+        separator: str = ", "
+    ) -> str:
+        """
+        Process a prompt and clean up the result in a single call.
+        Same result as clean_prompt(process_prompt(...)), but the wildcard
+        pass is skipped when there is nothing to replace.
+        
+        Args:
+            text: The main prompt text
+            prefix: Optional text to prepend
+            suffix: Optional text to append
+            wildcard_values: Dictionary mapping wildcard names to values
+            separator: Separator to use between parts
+            
+        Returns:
+            Fully processed and cleaned prompt string
+        """
+        result = cls.combine_prompt(text, prefix, suffix, separator)
+        
+        # Every placeholder starts with "{wildcard_", so one find() rules the pass out
+        if wildcard_values and "{wildcard_" in result:
+            result = WildcardParser.replace_wildcards(result, wildcard_values)
+        
+        return cls.clean_prompt(result)
+    
     @classmethod
     def get_required_wildcards(cls, text: str) -> list:
         """
@@ -129,7 +182,7 @@ class TextProcessor:
         Returns:
             List of wildcard names (e.g., ['wildcard_color', 'wildcard_style'])
         """
-        return WildcardParser.extract_wildcard_names(text)
+        return list(_extract_wildcard_names(text))
     
     @classmethod
     def get_combined_wildcards(
@@ -147,12 +200,11 @@ class TextProcessor:
         Returns:
             List of unique wildcard names from both prompts
         """
-        positive_wildcards = set(WildcardParser.extract_wildcard_names(positive_text))
-        negative_wildcards = set(WildcardParser.extract_wildcard_names(negative_text))
-        
-        # Combine and sort for consistent ordering
-        all_wildcards = positive_wildcards.union(negative_wildcards)
-        return sorted(list(all_wildcards))
+        # Combine into one set and sort for consistent ordering
+        return sorted({
+            *_extract_wildcard_names(positive_text),
+            *_extract_wildcard_names(negative_text)
+        })
     
     @classmethod
     def validate_wildcards(
@@ -170,8 +222,7 @@ class TextProcessor:
         Returns:
             Tuple of (is_valid, missing_wildcards)
         """
-        required = cls.get_required_wildcards(text)
-        missing = [w for w in required if w not in available_wildcards]
+        missing = [w for w in _extract_wildcard_names(text) if w not in available_wildcards]
         return (len(missing) == 0, missing)
     
     @classmethod
@@ -188,12 +239,12 @@ class TextProcessor:
         if not text:
             return ""
         
-        # Replace multiple spaces with single space
-        import re
-        text = re.sub(r' +', ' ', text)
+        # Clean up comma spacing: C-level split/strip/join instead of a regex pass
+        text = ", ".join([part.strip() for part in text.split(',')])
         
-        # Clean up comma spacing
-        text = re.sub(r'\s*,\s*', ', ', text)
+        # Replace multiple spaces with single space, if there are any
+        if "  " in text:
+            text = cls._MULTISPACE_PATTERN.sub(' ', text)
         
         # Remove leading/trailing whitespace
         text = text.strip()
@@ -4,14 +4,34 @@ Handles parsing of wildcard patterns and value lists.
 """
 
 import re
-from typing import List, Set, Tuple
+import functools
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_value_list_cached(text: str) -> Tuple[str, ...]:
+    """Memoized WildcardParser._parse_values; the tuples are shared between callers."""
+    return WildcardParser._parse_values(text)
 
 
 class WildcardParser:
     """Parses wildcard patterns from text and handles value list parsing."""
     
-    # Pattern to match {wildcard_name} placeholders
-    WILDCARD_PATTERN = re.compile(r'\{wildcard_([a-zA-Z0-9_]+)\}')
+    # Pattern to match {wildcard_name} placeholders; group 1 is the full 'wildcard_name'
+    WILDCARD_PATTERN = re.compile(r'\{(wildcard_[a-zA-Z0-9_]+)\}')
+    
+    # Returned by compile_for when there are no names to match
+    _NEVER_MATCH_PATTERN = re.compile(r'(?!)')
+    
+    # Bracket characters, located by _find_groups
+    _PAREN_CHAR_PATTERN = re.compile(r'[()]')
+    _CURLY_CHAR_PATTERN = re.compile(r'[{}]')
+    
+    # Masks the delimiters inside a bracket group (same length, so offsets still match)
+    _MASK_TABLE = str.maketrans('\n|,', '   ')
+    
+    # Valid wildcard names: alphanumeric and underscores only
+    _VALID_NAME_PATTERN = re.compile(r'\A[a-zA-Z0-9_]+\Z')
     
     @classmethod
     def extract_wildcard_names(cls, text: str) -> List[str]:
@@ -22,61 +42,113 @@ class WildcardParser:
             text: Text containing {wildcard_name} patterns
             
         Returns:
-            List of unique wildcard names (without the 'wildcard_' prefix in the match,
-            but we return the full name for port labeling)
+            List of unique full wildcard names (e.g. 'wildcard_color', as used
+            for port labeling)
         """
-        matches = cls.WILDCARD_PATTERN.findall(text)
         # Return unique names while preserving order of first occurrence
-        seen: Set[str] = set()
-        unique_names: List[str] = []
-        for name in matches:
-            full_name = f"wildcard_{name}"
-            if full_name not in seen:
-                seen.add(full_name)
-                unique_names.append(full_name)
-        return unique_names
+        return list(dict.fromkeys(cls.WILDCARD_PATTERN.findall(text)))
     
     @classmethod
-    def replace_wildcards(cls, text: str, wildcard_values: dict) -> str:
+    def compile_for(cls, names: Iterable[str]) -> Pattern[str]:
+        """
+        Compile a placeholder pattern that only matches the given wildcards.
+        Callers that replace the same set of wildcards in many prompts can
+        compile it once and pass it to replace_wildcards.
+        
+        Args:
+            names: Full wildcard names (e.g. 'wildcard_color')
+            
+        Returns:
+            Compiled pattern; like WILDCARD_PATTERN, group 1 is the full name
+        """
+        names = sorted(set(names))
+        if not names:
+            return cls._NEVER_MATCH_PATTERN
+        return re.compile(r'\{(' + '|'.join(map(re.escape, names)) + r')\}')
+    
+    @classmethod
+    def replace_wildcards(
+        cls,
+        text: str,
+        wildcard_values: dict,
+        pattern: Optional[Pattern[str]] = None
+    ) -> str:
         """
         Replace wildcard placeholders with their values.
         Any wildcard in the text that doesn't have a value provided will be
-        replaced with an empty string.
+        replaced with an empty string, as are wildcards inside the values.
         
         Args:
             text: Text containing {wildcard_name} patterns
             wildcard_values: Dictionary mapping wildcard names to their values
                             Keys should be like 'wildcard_color' (full name)
+            pattern: Optional pattern from compile_for to use instead of
+                     WILDCARD_PATTERN; placeholders it doesn't match are left as is
             
         Returns:
             Text with wildcards replaced by their values (or empty string)
         """
-        result = text
+        if '{' not in text:
+            return text
+        
+        # Look up each wildcard the text uses, once, instead of normalizing the whole dict
+        lookup = {}
         
-        # First, replace wildcards that have values
-        for name, value in wildcard_values.items():
-            # Handle both 'wildcard_name' and just 'name' formats in the dict
-            if name.startswith('wildcard_'):
-                pattern = '{' + name + '}'
-            else:
-                pattern = '{wildcard_' + name + '}'
-            result = result.replace(pattern, str(value) if value else "")
+        def replace(match):
+            name = match.group(1)
+            value = lookup.get(name)
+            if value is None:
+                value = lookup[name] = cls._lookup_value(wildcard_values, name)
+            return value
         
-        # Then, replace any remaining wildcards with empty string
-        # This handles wildcards that exist in text but have no value provided
-        remaining_wildcards = cls.extract_wildcard_names(result)
-        for wc_name in remaining_wildcards:
-            pattern = '{' + wc_name + '}'
-            result = result.replace(pattern, "")
+        # Replace every wildcard in one pass; wildcards without a value become ""
+        if pattern is not None:
+            return pattern.sub(replace, text)
+        result = cls.WILDCARD_PATTERN.sub(replace, text)
         
+        # Values may hold placeholders of their own; blank any the pass brought in
+        if '{wildcard_' in result:
+            result = cls.WILDCARD_PATTERN.sub('', result)
         return result
     
+    @staticmethod
+    def _lookup_value(wildcard_values: dict, name: str) -> str:
+        """
+        Get the replacement text for one wildcard.
+        Handles both 'wildcard_name' and just 'name' formats in the dict;
+        if both are given, the first one wins.
+        
+        Args:
+            wildcard_values: Dictionary mapping wildcard names to their values
+            name: Full wildcard name from the text (e.g. 'wildcard_color')
+            
+        Returns:
+            The value as a string, or "" if there is none
+        """
+        short_name = name[9:] if name.startswith('wildcard_') else None
+        # A key that already starts with 'wildcard_' isn't prefixed again
+        if short_name is not None and short_name.startswith('wildcard_'):
+            short_name = None
+        
+        if name in wildcard_values:
+            key = name
+            if short_name is not None and short_name in wildcard_values:
+                key = next(key for key in wildcard_values if key == name or key == short_name)
+        elif short_name is not None and short_name in wildcard_values:
+            key = short_name
+        else:
+            return ""
+        
+        value = wildcard_values[key]
+        return str(value) if value else ""
+    
     @classmethod
     def parse_value_list(cls, text: str) -> List[str]:
         """
         Parse a text string into a list of values.
         Supports newline, comma, and pipe delimiters.
         Treats content inside parentheses () or curly braces {} as single entries.
+        Results are cached per text, so repeated calls for the same list are cheap.
         
         Args:
             text: Text containing values separated by newlines, commas, or pipes
@@ -84,99 +156,226 @@ class WildcardParser:
         Returns:
             List of parsed values
         """
-        if not text or not text.strip():
-            return []
+        return list(_parse_value_list_cached(text))
+    
+    @classmethod
+    def parse_value_tuple(cls, text: str) -> Tuple[str, ...]:
+        """
+        Parse a text string into a tuple of values.
+        Same as parse_value_list, but returns the cached tuple itself instead of
+        a copy, for callers that only read the values.
+        
+        Args:
+            text: Text containing values separated by newlines, commas, or pipes
+            
+        Returns:
+            Tuple of parsed values
+        """
+        return _parse_value_list_cached(text)
+    
+    @classmethod
+    def clear_cache(cls):
+        """Clear the cache of parsed value lists."""
+        _parse_value_list_cached.cache_clear()
+    
+    @classmethod
+    def _parse_values(cls, text: str) -> Tuple[str, ...]:
+        """
+        Parse a text string into a tuple of values, without caching.
+        See parse_value_list.
         
-        # First, protect bracketed content by replacing delimiters inside brackets
-        protected_text, replacements = cls._protect_brackets(text)
+        Args:
+            text: Text containing values separated by newlines, commas, or pipes
+            
+        Returns:
+            Tuple of parsed values
+        """
+        if not text:
+            return ()
+        
+        # Probe each delimiter once; the results are reused to pick the split below
+        has_newline = '\n' in text
+        has_pipe = '|' in text
+        has_comma = ',' in text
+        
+        # Without any delimiter the whole text is one value, brackets or not
+        if not (has_newline or has_pipe or has_comma):
+            value = text.strip()
+            return (value,) if value else ()
+        
+        if text.isspace():
+            return ()
+        
+        # First, mask delimiters inside bracket groups so they don't split values.
+        # The masked text lines up with the original, so values are sliced from the original
+        masked = cls._mask_groups(text)
+        if masked is not text:
+            # Masking only removes delimiters, so only those found above need rechecking
+            has_newline = has_newline and '\n' in masked
+            has_pipe = has_pipe and '|' in masked
+            has_comma = has_comma and ',' in masked
         
         # Determine the primary delimiter
         # Priority: newline > pipe > comma (if multiple exist, use the most structured one)
-        if '\n' in protected_text:
-            # Split by newlines, but also handle commas/pipes within lines
-            lines = protected_text.split('\n')
+        if has_newline:
+            # Split by newlines, but also handle commas/pipes within lines.
+            # With only one of pipe/comma present, every line splits on that one,
+            # so map it to a newline (same length) and split the whole text at once
+            if not has_pipe or not has_comma:
+                split_masked = masked.replace('|' if has_pipe else ',', '\n')
+                # With nothing masked the mapped text can be split directly
+                split_text = split_masked if masked is text else text
+                return tuple(cls._split_values(split_text, split_masked, '\n'))
+            
             values = []
-            for line in lines:
-                line = line.strip()
-                if line:
-                    # Check if line contains pipes or commas (outside brackets)
-                    if '|' in line:
-                        values.extend([v.strip() for v in line.split('|') if v.strip()])
-                    elif ',' in line:
-                        values.extend([v.strip() for v in line.split(',') if v.strip()])
-                    else:
-                        values.append(line)
-        elif '|' in protected_text:
-            values = [v.strip() for v in protected_text.split('|') if v.strip()]
-        elif ',' in protected_text:
-            values = [v.strip() for v in protected_text.split(',') if v.strip()]
+            start = 0
+            for line in masked.split('\n'):
+                end = start + len(line)
+                # Check if line contains pipes or commas (outside brackets)
+                if '|' in line:
+                    values.extend(cls._split_values(text, masked, '|', start, end))
+                elif ',' in line:
+                    values.extend(cls._split_values(text, masked, ',', start, end))
+                else:
+                    value = text[start:end].strip()
+                    if value:
+                        values.append(value)
+                start = end + 1
+        elif has_pipe:
+            values = cls._split_values(text, masked, '|')
+        elif has_comma:
+            values = cls._split_values(text, masked, ',')
         else:
-            # Single value
-            values = [protected_text.strip()] if protected_text.strip() else []
+            # Single value (all delimiters were inside bracket groups)
+            return (text.strip(),)
         
-        # Restore protected content
-        restored_values = []
-        for value in values:
-            restored = cls._restore_brackets(value, replacements)
-            if restored:
-                restored_values.append(restored)
+        return tuple(values)
+    
+    @staticmethod
+    def _split_values(
+        text: str,
+        masked: str,
+        separator: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[str]:
+        """
+        Split masked[start:end] on a separator and return the matching parts of text.
         
-        return restored_values
+        Args:
+            text: Original text
+            masked: Text with delimiters inside bracket groups masked
+            separator: Delimiter to split on
+            start: Start offset of the segment to split
+            end: End offset of the segment to split (default: end of text)
+            
+        Returns:
+            Stripped, non-empty values sliced from the original text
+        """
+        if masked is text:
+            # Nothing was masked, so the split parts are the values
+            values = [part.strip() for part in text[start:end].split(separator)]
+            return [value for value in values if value]
+        
+        values = []
+        for part in masked[start:end].split(separator):
+            value = text[start:start + len(part)].strip()
+            if value:
+                values.append(value)
+            start += len(part) + 1
+        return values
     
     @classmethod
-    def _protect_brackets(cls, text: str) -> Tuple[str, dict]:
+    def _mask_groups(cls, text: str) -> str:
         """
-        Replace content inside brackets with placeholders to protect from splitting.
+        Mask newline, pipe and comma delimiters inside bracket groups.
         
         Args:
             text: Original text
             
         Returns:
-            Tuple of (protected text, replacement dictionary)
-        """
-        replacements = {}
-        counter = 0
-        result = text
-        
-        # Protect parentheses content: (...)
-        paren_pattern = re.compile(r'\([^()]*\)')
-        while paren_pattern.search(result):
-            match = paren_pattern.search(result)
-            if match:
-                placeholder = f"__PAREN_{counter}__"
-                replacements[placeholder] = match.group(0)
-                result = result[:match.start()] + placeholder + result[match.end():]
-                counter += 1
-        
-        # Protect curly brace content: {...}
-        # But NOT our wildcard patterns {wildcard_...}
-        curly_pattern = re.compile(r'\{(?!wildcard_)[^{}]*\}')
-        while curly_pattern.search(result):
-            match = curly_pattern.search(result)
-            if match:
-                placeholder = f"__CURLY_{counter}__"
-                replacements[placeholder] = match.group(0)
-                result = result[:match.start()] + placeholder + result[match.end():]
-                counter += 1
-        
-        return result, replacements
+            Text of the same length with delimiters inside groups replaced by
+            spaces (the text itself if there was nothing to mask)
+        """
+        if '(' not in text and '{' not in text:
+            return text
+        
+        parts = []
+        last = 0
+        for start, end in cls._find_groups(text):
+            group = text[start:end]
+            masked_group = group.translate(cls._MASK_TABLE)
+            if masked_group != group:
+                parts.append(text[last:start])
+                parts.append(masked_group)
+                last = end
+        
+        # Return the text itself when no group held a delimiter
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
     
     @classmethod
-    def _restore_brackets(cls, text: str, replacements: dict) -> str:
+    def _find_groups(cls, text: str) -> List[Tuple[int, int]]:
         """
-        Restore protected bracket content.
+        Find the outermost bracket groups that are treated as single entries.
+        Parentheses () are matched first. Curly braces {} outside of them are
+        matched next, skipping our {wildcard_...} placeholders and any group
+        that contains one.
         
         Args:
-            text: Text with placeholders
-            replacements: Dictionary of placeholder -> original content
+            text: Original text
             
         Returns:
-            Text with original bracket content restored
+            Sorted, non-overlapping list of (start, end) offsets
         """
-        result = text
-        for placeholder, original in replacements.items():
-            result = result.replace(placeholder, original)
-        return result
+        # Match parentheses, keeping only the outermost groups
+        paren_groups = []
+        if '(' in text:
+            opened = []
+            for match in cls._PAREN_CHAR_PATTERN.finditer(text):
+                pos = match.start()
+                if text[pos] == '(':
+                    opened.append(pos)
+                elif opened:
+                    start = opened.pop()
+                    while paren_groups and paren_groups[-1][0] > start:
+                        paren_groups.pop()
+                    paren_groups.append((start, pos + 1))
+        
+        if '{' not in text:
+            return paren_groups
+        
+        # Match curly braces in the gaps between those groups; entries are [start, blocked]
+        curly_groups = []
+        opened = []
+        bounds = [0, *(pos for group in paren_groups for pos in group), len(text)]
+        for gap_start, gap_end in zip(bounds[::2], bounds[1::2]):
+            for match in cls._CURLY_CHAR_PATTERN.finditer(text, gap_start, gap_end):
+                pos = match.start()
+                if text[pos] == '{':
+                    opened.append([pos, text.startswith('wildcard_', pos + 1)])
+                elif opened:
+                    start, blocked = opened.pop()
+                    if blocked:
+                        # A placeholder can't be grouped, so neither can anything around it
+                        if opened:
+                            opened[-1][1] = True
+                        continue
+                    while curly_groups and curly_groups[-1][0] > start:
+                        curly_groups.pop()
+                    curly_groups.append((start, pos + 1))
+        
+        if not curly_groups:
+            return paren_groups
+        
+        # Merge, dropping parenthesized groups inside curly groups
+        groups = []
+        for group in sorted(paren_groups + curly_groups):
+            if not groups or group[0] >= groups[-1][1]:
+                groups.append(group)
+        return groups
     
     @classmethod
     def format_as_dynamic_prompts(cls, values: List[str]) -> str:
@@ -193,7 +392,7 @@ class WildcardParser:
             return ""
         if len(values) == 1:
             return values[0]
-        return "{" + "|".join(values) + "}"
+        return f'{{{"|".join(values)}}}'
     
     @classmethod
     def count_values(cls, text: str) -> int:
@@ -206,7 +405,7 @@ class WildcardParser:
         Returns:
             Number of values
         """
-        return len(cls.parse_value_list(text))
+        return len(_parse_value_list_cached(text))
     
     @classmethod
     def get_value_at_index(cls, text: str, index: int) -> str:
@@ -220,7 +419,7 @@ class WildcardParser:
         Returns:
             The value at the specified index, or empty string if out of range
         """
-        values = cls.parse_value_list(text)
+        values = _parse_value_list_cached(text)
         if 0 <= index < len(values):
             return values[index]
         return ""
@@ -239,4 +438,4 @@ class WildcardParser:
         if not name:
             return False
         # Only allow alphanumeric and underscores
-        return bool(re.match(r'^[a-zA-Z0-9_]+$', name))
+        return cls._VALID_NAME_PATTERN.match(name) is not None